@@ -0,0 +1,105 @@
+"""Benchmark the embedding backends: query latency, concurrent throughput, RSS and cosine agreement.
+
+Each backend runs in its own subprocess so import cost and RSS are measured in isolation.
+    python bench_embeddings.py [--queries 200] [--concurrency 16]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+SENTENCES = [
+    "How do I configure hybrid search with BM25 and vectors?",
+    "What is reciprocal rank fusion?",
+    "Error 500 returned when uploading a PDF file",
+    "FlashRank re-ranks passages with a cross-encoder.",
+    "Chroma persists the knowledge base under data/chroma_db.",
+    "Which model is used to generate the chat thread title?",
+    "The quick brown fox jumps over the lazy dog.",
+    "Maximal marginal relevance trades off relevance and diversity.",
+]
+
+
+def _load(backend: str):
+    if backend == "onnx":
+        from onnx_embeddings import OnnxEmbeddings
+        return OnnxEmbeddings()
+    from langchain_huggingface import HuggingFaceEmbeddings
+    import config as cfg
+    return HuggingFaceEmbeddings(model_name=cfg.EMBEDDING_MODEL)
+
+
+def run_backend(backend: str, n_queries: int, concurrency: int, out_path: str):
+    t0 = time.perf_counter()
+    emb = _load(backend)
+    emb.embed_query("warmup")
+    load_s = time.perf_counter() - t0
+
+    queries = [SENTENCES[i % len(SENTENCES)] + f" #{i}" for i in range(n_queries)]
+
+    # Sequential single-query latency
+    latencies = []
+    for q in queries:
+        s = time.perf_counter()
+        emb.embed_query(q)
+        latencies.append((time.perf_counter() - s) * 1000)
+
+    # Concurrent throughput (ONNX micro-batches these)
+    s = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(emb.embed_query, queries))
+    throughput = n_queries / (time.perf_counter() - s)
+
+    np.save(out_path, np.array([emb.embed_query(t) for t in SENTENCES], dtype=np.float32))
+    print(json.dumps({
+        "backend": backend,
+        "load_s": round(load_s, 2),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 2),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 2),
+        "throughput_qps": round(throughput, 1),
+        # ru_maxrss is KiB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--backend", help=argparse.SUPPRESS)
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.backend:
+        run_backend(args.backend, args.queries, args.concurrency, args.out)
+        return
+
+    tmp = tempfile.mkdtemp()
+    vectors = {}
+    for backend in ("huggingface", "onnx"):
+        out = os.path.join(tmp, f"{backend}.npy")
+        proc = subprocess.run(
+            [sys.executable, __file__, "--backend", backend, "--out", out,
+             "--queries", str(args.queries), "--concurrency", str(args.concurrency)],
+            capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            print(f"{backend}: failed\n{proc.stderr[-500:]}")
+            continue
+        print(proc.stdout.strip().splitlines()[-1])
+        vectors[backend] = np.load(out)
+
+    if len(vectors) == 2:
+        # Both backends return L2-normalised vectors, so the dot product is the cosine
+        cos = (vectors["huggingface"] * vectors["onnx"]).sum(axis=1)
+        print(json.dumps({"cosine_mean": round(float(cos.mean()), 4), "cosine_min": round(float(cos.min()), 4)}))
+
+
+if __name__ == "__main__":
+    main()
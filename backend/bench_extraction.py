@@ -0,0 +1,69 @@
+"""Compare full-page text (what WebBaseLoader indexes) with main-content extraction on saved HTML pages.
+
+Chunks on the extraction side are the Documents load_from_urls would index (section_documents);
+the full-page baseline is split with the same CHUNK_SIZE / CHUNK_OVERLAP.
+
+    python bench_extraction.py [fixtures/html]
+"""
+import json
+import os
+import sys
+import time
+from bs4 import BeautifulSoup
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from html_extract import extract_main_content, remove_repeated_blocks
+from loaders import section_documents
+import config as cfg
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "html")
+
+
+def main():
+    folder = sys.argv[1] if len(sys.argv) > 1 else FIXTURES
+    splitter = RecursiveCharacterTextSplitter(chunk_size=cfg.CHUNK_SIZE, chunk_overlap=cfg.CHUNK_OVERLAP)
+    # Each sub-directory holds pages from one site
+    sites = sorted(d for d in os.listdir(folder) if os.path.isdir(os.path.join(folder, d)))
+
+    totals = {"full_bytes": 0, "main_bytes": 0, "full_chunks": 0, "main_chunks": 0}
+    names, extract_s = [], 0.0
+    for site in sites:
+        site_dir = os.path.join(folder, site)
+        site_names = sorted(n for n in os.listdir(site_dir) if n.endswith((".html", ".htm")))
+        htmls = [open(os.path.join(site_dir, n), "rb").read() for n in site_names]
+
+        s = time.perf_counter()
+        pages = [extract_main_content(h) for h in htmls]
+        extracted = remove_repeated_blocks([sections for _, sections in pages])
+        extract_s += time.perf_counter() - s
+
+        for name, html, (title, _), sections in zip(site_names, htmls, pages, extracted):
+            full = BeautifulSoup(html, "html.parser").get_text()
+            main_text = "\n\n".join("\n".join(s["headings"][-1:] + s["blocks"]) for s in sections)
+            docs = section_documents(f"{site}/{name}", title, sections)
+            row = {
+                "page": f"{site}/{name}",
+                "full_bytes": len(full.encode("utf-8")),
+                "main_bytes": len(main_text.encode("utf-8")),
+                "full_chunks": len(splitter.split_text(full)),
+                "main_chunks": len(docs),
+                "max_chunk_chars": max((len(d.page_content) for d in docs), default=0),
+            }
+            for key in totals:
+                totals[key] += row[key]
+            names.append(row["page"])
+            print(json.dumps(row))
+    extract_ms = extract_s * 1000 / max(len(names), 1)
+
+    n = max(len(names), 1)
+    print(json.dumps({
+        "pages": len(names),
+        "avg_extract_ms": round(extract_ms, 2),
+        "bytes_per_page": [round(totals["full_bytes"] / n), round(totals["main_bytes"] / n)],
+        "chunks_per_page": [round(totals["full_chunks"] / n, 2), round(totals["main_chunks"] / n, 2)],
+        "byte_reduction": f"{1 - totals['main_bytes'] / max(totals['full_bytes'], 1):.0%}",
+        "chunk_reduction": f"{1 - totals['main_chunks'] / max(totals['full_chunks'], 1):.0%}",
+    }))
+
+
+if __name__ == "__main__":
+    main()
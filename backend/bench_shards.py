@@ -0,0 +1,89 @@
+"""Scaling benchmark: single collection vs sharded fan-out search on synthetic chunks.
+
+Uses random unit vectors instead of the embedding model, so only the store is measured.
+    python bench_shards.py [--sizes 1000,10000,100000,1000000] [--shard-size 5000] [--sources 200]
+"""
+import argparse
+import json
+import shutil
+import tempfile
+import time
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from sharded_store import ShardedStore
+
+DIM = 384  # all-MiniLM-L6-v2
+ADD_BATCH = 5000  # Stay under Chroma's max batch size
+
+
+class RandomEmbeddings(Embeddings):
+    def __init__(self, seed: int = 0):
+        self._rng = np.random.default_rng(seed)
+
+    def _vectors(self, n):
+        v = self._rng.standard_normal((n, DIM)).astype(np.float32)
+        return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+    def embed_documents(self, texts):
+        return self._vectors(len(texts)).tolist()
+
+    def embed_query(self, text):
+        return self._vectors(1)[0].tolist()
+
+
+def _build(n_chunks: int, n_sources: int, strategy: str, shard_size: int) -> tuple[ShardedStore, str]:
+    path = tempfile.mkdtemp()
+    store = ShardedStore(path, RandomEmbeddings(), strategy=strategy, max_chunks=shard_size)
+    for start in range(0, n_chunks, ADD_BATCH):
+        store.add_documents([
+            # Sources arrive one after another, as they do when ingesting pages/files
+            Document(page_content=f"chunk {i}", metadata={"title": f"source-{i * n_sources // n_chunks}"})
+            for i in range(start, min(start + ADD_BATCH, n_chunks))
+        ])
+    return store, path
+
+
+def _time(fn, n_queries: int) -> float:
+    """Median latency in ms."""
+    samples = []
+    for i in range(n_queries):
+        s = time.perf_counter()
+        fn(f"query {i}")
+        samples.append((time.perf_counter() - s) * 1000)
+    return round(float(np.median(samples)), 2)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000")
+    parser.add_argument("--shard-size", type=int, default=5000)
+    parser.add_argument("--sources", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    for n_chunks in (int(s) for s in args.sizes.split(",")):
+        # A single huge shard behaves like the old single-collection store
+        configs = {"single": ("size", n_chunks), "sharded": ("source", args.shard_size)}
+        for label, (strategy, shard_size) in configs.items():
+            s = time.perf_counter()
+            store, path = _build(n_chunks, args.sources, strategy, shard_size)
+            build_s = time.perf_counter() - s
+            active = ["source-0", "source-1"]
+            print(json.dumps({
+                "chunks": n_chunks,
+                "layout": label,
+                "shards": len(store._route()),
+                "shards_for_active": len(store._route(active)),
+                "build_s": round(build_s, 1),
+                "similarity_ms": _time(lambda q: store.similarity_search(q, k=20), args.queries),
+                "mmr_ms": _time(lambda q: store.max_marginal_relevance_search(q, k=20, fetch_k=50), args.queries),
+                "filtered_mmr_ms": _time(
+                    lambda q: store.max_marginal_relevance_search(q, k=20, fetch_k=50, sources=active), args.queries
+                ),
+            }))
+            shutil.rmtree(path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,11 +10,23 @@ OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
 MODEL = os.getenv("MODEL", "google/gemini-2.0-flash-exp:free") 
 BASE_URL = "https://openrouter.ai/api/v1"
 
+# --- Storage ---
+CHROMA_PATH = os.path.join(os.path.dirname(__file__), "data", "chroma_db")
+
 # --- Embeddings ---
 EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+# "huggingface" (sentence-transformers/PyTorch) or "onnx" (int8 ONNX Runtime, see onnx_embeddings.py)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "huggingface")
+ONNX_MAX_BATCH_SIZE = 32
 
 # --- RAG Parameters ---
 CHUNK_SIZE = 1000
 CHUNK_OVERLAP = 150
 RETRIEVER_K = 4
 LLM_TEMPERATURE = 0.3
+
+# --- Sharding ---
+# "source" keeps each source in one shard; "size" fills shards up to SHARD_MAX_CHUNKS
+SHARD_STRATEGY = os.getenv("SHARD_STRATEGY", "source")
+SHARD_MAX_CHUNKS = int(os.getenv("SHARD_MAX_CHUNKS", "5000"))
+SHARD_SEARCH_WORKERS = 8
@@ -0,0 +1,162 @@
+"""Main-content extraction for web pages: strips site chrome and keeps the heading structure."""
+import re
+from collections import Counter
+from bs4 import BeautifulSoup, NavigableString, Tag
+
+# Never content
+DROP_TAGS = ["script", "style", "noscript", "template", "svg", "iframe", "form", "button", "input", "select",
+             "nav", "aside"]
+# Site chrome, unless used inside the article itself (e.g. an <article><header><h1>)
+CHROME_TAGS = ["header", "footer"]
+BOILERPLATE_ROLES = {"navigation", "banner", "contentinfo", "complementary", "search", "dialog", "menu"}
+# Matched against class/id tokens, e.g. "site-footer" -> {"site", "footer"}
+BOILERPLATE_TOKENS = {
+    "nav", "navbar", "navigation", "menu", "footer", "sidebar", "cookie", "cookies", "consent", "banner",
+    "breadcrumb", "breadcrumbs", "share", "social", "ad", "ads", "advert", "advertisement", "promo",
+    "newsletter", "subscribe", "comments", "related", "popup", "modal", "skip", "toc",
+}
+HEADING_TAGS = ["h1", "h2", "h3", "h4", "h5", "h6"]
+BLOCK_TAGS = HEADING_TAGS + ["p", "li", "pre", "blockquote", "tr", "dt", "dd", "figcaption"]
+CONTAINER_TAGS = ["div", "section", "main", "article"]
+CONTENT_ROOTS = ["main", "article"]
+MAX_LINK_DENSITY = 0.6  # Without a <main>/<article>, blocks that are mostly link text are navigation
+# Class/id tokens only mark a block as chrome when it is small and link-heavy, so a wrapper
+# like <div class="layout has-sidebar"> around the article survives
+MAX_CHROME_TEXT_SHARE = 0.2
+MIN_CHROME_LINK_DENSITY = 0.3
+# Repeated-block detection: shorter fingerprints ("Yes", "24") never count as template text,
+# and digits are only collapsed (years, counters) in blocks with enough letters around them
+MIN_FINGERPRINT_CHARS = 8
+MIN_LETTERS_TO_COLLAPSE_DIGITS = 20
+
+
+def _text_len(el) -> int:
+    return len(_clean(el.get_text(" ")))
+
+
+def _is_protected(el, page_chars: int) -> bool:
+    """Elements that hold (or are) the main content are never removed."""
+    if el.name in ("html", "body") or el.name in CONTENT_ROOTS or el.get("role") == "main":
+        return True
+    if el.find(CONTENT_ROOTS) or el.find(attrs={"role": "main"}):
+        return True
+    return _text_len(el) > page_chars / 2
+
+
+def _is_boilerplate(el, page_chars: int) -> bool:
+    if el.get("role") in BOILERPLATE_ROLES or el.get("aria-hidden") == "true":
+        return True
+    names = " ".join(el.get("class", [])) + " " + (el.get("id") or "")
+    if not BOILERPLATE_TOKENS.intersection(re.split(r"[\s_-]+", names.lower())):
+        return False
+    text = _clean(el.get_text(" "))
+    return len(text) <= page_chars * MAX_CHROME_TEXT_SHARE and _link_density(el, text) >= MIN_CHROME_LINK_DENSITY
+
+
+def _link_density(el, text: str) -> float:
+    link_chars = sum(len(a.get_text(" ", strip=True)) for a in el.find_all("a"))
+    return link_chars / max(len(text), 1)
+
+
+def _clean(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _own_text(el) -> str:
+    """Text of a container that is not inside one of its block or container children."""
+    parts = []
+    for child in el.children:
+        if isinstance(child, Tag):
+            if child.name in BLOCK_TAGS + CONTAINER_TAGS or child.find(BLOCK_TAGS + CONTAINER_TAGS):
+                continue
+            parts.append(child.get_text(" "))
+        elif type(child) is NavigableString:  # Skips comments, doctypes, CDATA
+            parts.append(str(child))
+    return _clean(" ".join(parts))
+
+
+def extract_main_content(html: str | bytes) -> tuple[str, list[dict]]:
+    """Return (page title, sections). Each section is {"headings": [h1, h2, ...], "blocks": [text, ...]}.
+
+    Pass raw bytes when the HTTP response has no charset so <meta charset> decides the encoding.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    title = _clean(soup.title.get_text()) if soup.title else ""
+    page_chars = _text_len(soup.body or soup)
+
+    # Elements nested in an already removed one are flagged as decomposed and skipped
+    for el in soup.find_all(DROP_TAGS):
+        if not el.decomposed and not _is_protected(el, page_chars):
+            el.decompose()
+    for el in soup.find_all(CHROME_TAGS):
+        if not el.decomposed and not el.find_parent(CONTENT_ROOTS) and not _is_protected(el, page_chars):
+            el.decompose()
+    for el in soup.find_all(True):
+        if not el.decomposed and _is_boilerplate(el, page_chars) and not _is_protected(el, page_chars):
+            el.decompose()
+
+    root = soup.find("main") or soup.find(attrs={"role": "main"}) or soup.find("article")
+    # Inside an explicit content root, link lists are content (references, "see also")
+    filter_links = root is None
+    root = root or soup.body or soup
+
+    sections = [{"headings": [], "blocks": []}]
+
+    def add(text):
+        if text:
+            sections[-1]["blocks"].append(text)
+
+    add(_own_text(root))
+    for el in root.find_all(BLOCK_TAGS + CONTAINER_TAGS):
+        if el.find_parent(BLOCK_TAGS):
+            continue  # Already emitted with its enclosing block (e.g. <p> or <div> inside <li>)
+        if el.name in CONTAINER_TAGS and el.find(BLOCK_TAGS + CONTAINER_TAGS):
+            # Its children are emitted on their own; keep the text sitting directly in it
+            add(_own_text(el))
+            continue
+
+        if el.name == "pre":
+            text = el.get_text().strip()
+        elif el.name == "tr":
+            text = " | ".join(_clean(c.get_text(" ")) for c in el.find_all(["td", "th"]))
+        else:
+            text = _clean(el.get_text(" "))
+        if not text:
+            continue
+        if el.name in HEADING_TAGS:
+            level = int(el.name[1])
+            headings = sections[-1]["headings"][:level - 1] + [text]
+            sections.append({"headings": headings, "blocks": []})
+        elif not filter_links or _link_density(el, text) <= MAX_LINK_DENSITY:
+            add(text)
+
+    return title, [s for s in sections if s["blocks"]]
+
+
+def _fingerprint(text: str) -> str:
+    """Near-duplicate key ignoring case and punctuation (any script). "" means never treat as repeated."""
+    text = text.lower()
+    if sum(c.isalpha() for c in text) >= MIN_LETTERS_TO_COLLAPSE_DIGITS:
+        text = re.sub(r"\d+", "0", text)
+    key = re.sub(r"[\W_]+", " ", text).strip()
+    return key if len(key) >= MIN_FINGERPRINT_CHARS else ""
+
+
+def remove_repeated_blocks(pages: list[list[dict]]) -> list[list[dict]]:
+    """Drop template blocks that recur across pages of the same site (pass one site's pages at a time)."""
+    if len(pages) < 2:
+        return pages
+    counts = Counter()
+    for sections in pages:
+        counts.update({_fingerprint(b) for s in sections for b in s["blocks"]})
+    threshold = max(2, len(pages) // 2 + 1)
+
+    cleaned = []
+    for sections in pages:
+        kept = []
+        for s in sections:
+            blocks = [b for b in s["blocks"] if not (fp := _fingerprint(b)) or counts[fp] < threshold]
+            if blocks:
+                kept.append({"headings": s["headings"], "blocks": blocks})
+        cleaned.append(kept)
+    return cleaned
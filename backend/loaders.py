@@ -1,7 +1,16 @@
 """Document and URL loading with metadata extraction."""
 import tempfile, os
 from urllib.parse import urlparse
+import requests
 from langchain_community.document_loaders import WebBaseLoader, PyPDFLoader, UnstructuredFileLoader
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from html_extract import extract_main_content, remove_repeated_blocks
+import config as cfg
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+}
 
 
 def _is_valid_url(url: str) -> bool:
@@ -23,28 +32,70 @@ def _extract_title(doc) -> str:
     return os.path.basename(source)
 
 
+def section_documents(url: str, title: str, sections: list[dict]) -> list:
+    """Chunk extracted sections along headings: small neighbouring sections are packed up to
+    CHUNK_SIZE and longer ones are split, so every Document fits the chunk budget."""
+    docs, parts, heading = [], [], None
+    size = 0
+    for s in sections:
+        text = "\n".join(([s["headings"][-1]] if s["headings"] else []) + s["blocks"])
+        if parts and size + len(text) > cfg.CHUNK_SIZE:
+            docs.append((heading, parts))
+            parts, size = [], 0
+        if not parts:
+            heading = " > ".join(s["headings"])
+        parts.append(text)
+        size += len(text)
+    if parts:
+        docs.append((heading, parts))
+    splitter = RecursiveCharacterTextSplitter(chunk_size=cfg.CHUNK_SIZE, chunk_overlap=cfg.CHUNK_OVERLAP)
+    return [
+        Document(page_content=piece, metadata={"source": url, "title": title, "section": h})
+        for h, p in docs
+        for piece in splitter.split_text("\n\n".join(p))
+    ]
+
+
+def _load_with_webbaseloader(url: str) -> list:
+    return WebBaseLoader(url, header_template=HEADERS).load()
+
+
 def load_from_urls(urls_text: str) -> tuple[list, list[str]]:
-    """Load documents from newline-separated URLs. Returns (docs, errors)."""
+    """Load documents from newline-separated URLs. Returns (docs, errors).
+
+    Pages go through main-content extraction; blocks repeated across pages of the same
+    site in this batch (menus, footers, banners) are dropped. Pages where extraction
+    finds nothing fall back to WebBaseLoader.
+    """
     docs, errors = [], []
     urls = [u.strip() for u in urls_text.strip().splitlines() if u.strip()]
+    pages = {}  # netloc -> [(url, title, sections)]
     for url in urls:
         if not _is_valid_url(url):
             errors.append(f"Invalid URL: {url}")
             continue
         try:
-            loader = WebBaseLoader(
-                url,
-                header_template={
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-                }
-            )
-            loaded = loader.load()
-            for d in loaded:
-                d.metadata["title"] = _extract_title(d)
-                d.metadata["source_url"] = url
-            docs.extend(loaded)
+            resp = requests.get(url, headers=HEADERS, timeout=30)
+            resp.raise_for_status()
+            # Without a charset in Content-Type, requests assumes ISO-8859-1; hand BeautifulSoup
+            # the raw bytes instead so it can honour <meta charset>
+            has_charset = "charset" in resp.headers.get("Content-Type", "").lower()
+            title, sections = extract_main_content(resp.text if has_charset else resp.content)
+            pages.setdefault(urlparse(url).netloc, []).append((url, title, sections))
         except Exception as e:
             errors.append(f"Failed to load {url}: {str(e)[:100]}")
+
+    for site_pages in pages.values():
+        cleaned = remove_repeated_blocks([sections for _, _, sections in site_pages])
+        for (url, title, _), sections in zip(site_pages, cleaned):
+            try:
+                loaded = section_documents(url, title, sections) or _load_with_webbaseloader(url)
+                for d in loaded:
+                    d.metadata["title"] = _extract_title(d)
+                    d.metadata["source_url"] = url
+                docs.extend(loaded)
+            except Exception as e:
+                errors.append(f"Failed to load {url}: {str(e)[:100]}")
     return docs, errors
 
 
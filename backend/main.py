@@ -7,10 +7,12 @@ from datetime import datetime
 from pathlib import Path
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, UploadFile, File
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, FileResponse
+from starlette.background import BackgroundTask
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from loaders import load_from_urls, load_from_files
+from snapshot import export_snapshot, import_snapshot
 from rag_engine import (
     # build_vectorstore, # Removed
     query, 
@@ -142,7 +144,9 @@ async def load_urls(req: URLRequest):
 
 
 @app.post("/api/chat")
-async def chat(req: ChatRequest):
+def chat(req: ChatRequest):
+    # Sync handler: FastAPI runs it in its thread pool, so the blocking RAG query does not
+    # stall the event loop and concurrent chats can share an ONNX embedding batch
     # Check if we have any data (optional, but good for UX)
     if not _state["sources"]:
          return {"ok": False, "error": "Knowledge base is empty. Please upload documents."}
@@ -322,6 +326,38 @@ async def delete_thread(thread_id: str):
     return {"ok": True}
 
 
+# Sync handlers: export/import block on disk and Chroma, so FastAPI runs them in its thread pool
+@app.get("/api/snapshot")
+def download_snapshot(dtype: str = "float16"):
+    fd, path = tempfile.mkstemp(suffix=".snap.gz")
+    os.close(fd)
+    try:
+        export_snapshot(get_vectorstore(), path, dtype)
+    except Exception as e:
+        os.remove(path)
+        return {"ok": False, "error": f"Export error: {str(e)[:200]}"}
+    return FileResponse(
+        path, filename="citeflow.snap.gz", media_type="application/gzip",
+        background=BackgroundTask(os.remove, path),
+    )
+
+
+@app.post("/api/snapshot")
+def upload_snapshot(file: UploadFile = File(...)):
+    fd, path = tempfile.mkstemp(suffix=".snap.gz")
+    try:
+        # Copy in chunks so large snapshots never sit fully in memory
+        with os.fdopen(fd, "wb") as out:
+            shutil.copyfileobj(file.file, out)
+        loaded = import_snapshot(get_vectorstore(), path)
+        _state["sources"] = list_sources()
+        return {"ok": True, "loaded": loaded, "sources": _state["sources"]}
+    except Exception as e:
+        return {"ok": False, "errors": [f"Import error: {str(e)[:200]}"]}
+    finally:
+        os.remove(path)
+
+
 @app.post("/api/clear")
 async def clear():
     clear_vectorstore()
@@ -0,0 +1,138 @@
+"""Quantised ONNX MiniLM embeddings with micro-batched query encoding.
+
+Drop-in replacement for HuggingFaceEmbeddings(all-MiniLM-L6-v2): same mean pooling
+and L2 normalisation, so vectors are compatible with the existing Chroma collection.
+
+Export the model once (needs torch + transformers, already pulled in by sentence-transformers):
+    python onnx_embeddings.py export
+"""
+import os
+import sys
+import threading
+from concurrent.futures import Future
+import numpy as np
+from langchain_core.embeddings import Embeddings
+import config as cfg
+
+ONNX_DIR = os.path.join(os.path.dirname(__file__), "data", "onnx_minilm")
+MODEL_FILE = "model_int8.onnx"
+MAX_SEQ_LENGTH = 256  # Same as the sentence-transformers config for all-MiniLM-L6-v2
+
+
+class OnnxEmbeddings(Embeddings):
+    """CPU ONNX Runtime embeddings.
+
+    A lone embed_query is encoded immediately; queries that arrive while a batch is being
+    encoded are queued and encoded together as the next batch.
+    """
+
+    def __init__(self, model_dir: str = ONNX_DIR, max_batch_size: int = cfg.ONNX_MAX_BATCH_SIZE):
+        # Optional dependencies (requirements-onnx.txt), only needed when this backend is selected
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_path = os.path.join(model_dir, MODEL_FILE)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"{model_path} not found. Run `python onnx_embeddings.py export` first.")
+
+        self._tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self._tokenizer.enable_truncation(max_length=MAX_SEQ_LENGTH)
+        self._tokenizer.enable_padding(pad_id=0, pad_token="[PAD]")
+
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self._session = ort.InferenceSession(model_path, opts, providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in self._session.get_inputs()}
+
+        self._start_batcher(max_batch_size)
+
+    def _start_batcher(self, max_batch_size: int):
+        self.max_batch_size = max_batch_size
+        # Pending (text, future) pairs waiting for the batching thread
+        self._pending = []
+        self._cond = threading.Condition()
+        threading.Thread(target=self._batch_loop, daemon=True).start()
+
+    def _encode(self, texts: list[str]) -> np.ndarray:
+        encodings = self._tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+
+        token_embeddings = self._session.run(None, feeds)[0]
+
+        # Mean pooling over real tokens, then L2 normalise (matches the ST Pooling + Normalize modules)
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+    def _batch_loop(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                # No waiting: whatever queued up during the previous encode forms this batch
+                batch = self._pending[:self.max_batch_size]
+                del self._pending[:self.max_batch_size]
+
+            try:
+                vectors = self._encode([text for text, _ in batch])
+                for (_, future), vec in zip(batch, vectors):
+                    future.set_result(vec.tolist())
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        texts = [t.replace("\n", " ") for t in texts]
+        vectors = []
+        for i in range(0, len(texts), self.max_batch_size):
+            vectors.extend(self._encode(texts[i:i + self.max_batch_size]).tolist())
+        return vectors
+
+    def embed_query(self, text: str) -> list[float]:
+        future = Future()
+        with self._cond:
+            self._pending.append((text.replace("\n", " "), future))
+            self._cond.notify()
+        return future.result()
+
+
+def export_model(out_dir: str = ONNX_DIR, model_name: str = cfg.EMBEDDING_MODEL):
+    """Export the HF model to ONNX and apply dynamic int8 quantisation."""
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    os.makedirs(out_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name).eval()
+    tokenizer.save_pretrained(out_dir)
+
+    fp32_path = os.path.join(out_dir, "model.onnx")
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    names = ["input_ids", "attention_mask", "token_type_ids"]
+    dynamic = {"batch": 0, "seq": 1}
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[n] for n in names),
+            fp32_path,
+            input_names=names,
+            output_names=["last_hidden_state"],
+            dynamic_axes={**{n: dynamic for n in names}, "last_hidden_state": dynamic},
+            opset_version=14,
+        )
+
+    quantize_dynamic(fp32_path, os.path.join(out_dir, MODEL_FILE), weight_type=QuantType.QInt8)
+    os.remove(fp32_path)
+    print(f"Exported int8 model to {out_dir}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["export"]:
+        export_model()
+    else:
+        print("Usage: python onnx_embeddings.py export")
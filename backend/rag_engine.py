@@ -1,11 +1,9 @@
 """RAG engine: Persistent Vector Store (Chroma), Hybrid Search (BM25+Vector), and Re-ranking."""
 import os
 import re
-import shutil
 import json
 from langchain_openai import ChatOpenAI
 from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_chroma import Chroma
 from langchain_community.retrievers import BM25Retriever
 # from langchain.retrievers import EnsembleRetriever # Removed
 from langchain_text_splitters import RecursiveCharacterTextSplitter
@@ -13,10 +11,11 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.documents import Document
 from flashrank import Ranker, RerankRequest
+from sharded_store import ShardedStore
 import config as cfg
 
 # Ensure Chroma directory exists
-CHROMA_PATH = os.path.join(os.path.dirname(__file__), "data", "chroma_db")
+CHROMA_PATH = cfg.CHROMA_PATH
 os.makedirs(CHROMA_PATH, exist_ok=True)
 
 _embeddings = None
@@ -27,8 +26,13 @@ _ranker = None
 def get_embeddings():
     global _embeddings
     if _embeddings is None:
-        # Use a high-quality local embedding model
-        _embeddings = HuggingFaceEmbeddings(model_name=cfg.EMBEDDING_MODEL)
+        if cfg.EMBEDDING_BACKEND == "onnx":
+            # Optional lightweight backend; imported lazily so onnxruntime stays optional
+            from onnx_embeddings import OnnxEmbeddings
+            _embeddings = OnnxEmbeddings()
+        else:
+            # Use a high-quality local embedding model
+            _embeddings = HuggingFaceEmbeddings(model_name=cfg.EMBEDDING_MODEL)
     return _embeddings
 
 def get_llm():
@@ -45,11 +49,8 @@ def get_llm():
 def get_vectorstore():
     global _vectorstore
     if _vectorstore is None:
-        _vectorstore = Chroma(
-            persist_directory=CHROMA_PATH,
-            embedding_function=get_embeddings(),
-            collection_name="rag_documents"
-        )
+        # Partitioned across Chroma collections; searches fan out to the relevant shards
+        _vectorstore = ShardedStore(CHROMA_PATH, get_embeddings())
     return _vectorstore
 
 def get_ranker():
@@ -60,15 +61,13 @@ def get_ranker():
     return _ranker
 
 def clear_vectorstore():
-    global _vectorstore
-    if os.path.exists(CHROMA_PATH):
-        # Force close connection if possible or just delete dir
-        try:
-            shutil.rmtree(CHROMA_PATH)
-            os.makedirs(CHROMA_PATH, exist_ok=True)
-            _vectorstore = None
-        except Exception as e:
-            print(f"Error clearing Chroma: {e}")
+    # Delete collections through chromadb rather than removing the directory: chromadb caches
+    # its client per path, so a new store would still see the old collections (read-only)
+    try:
+        store = _vectorstore or ShardedStore(CHROMA_PATH, None)
+        store.clear()
+    except Exception as e:
+        print(f"Error clearing Chroma: {e}")
 
 def list_sources():
     """List all unique sources in the vector store."""
@@ -109,21 +108,12 @@ def get_hybrid_retriever(vectorstore, active_sources=None):
     
     # 1. Vector Retriever
     # Using MMals (Maximal Marginal Relevance) for diversity
+    # active_sources restricts the search to the shards (and chunks) holding those sources
     base_retriever = vectorstore.as_retriever(
         search_type="mmr", 
-        search_kwargs={"k": 20, "fetch_k": 50} 
+        search_kwargs={"k": 20, "fetch_k": 50},
+        sources=active_sources
     )
-    
-    # Apply filter if active_sources provided
-    if active_sources:
-        base_retriever = vectorstore.as_retriever(
-            search_type="mmr",
-            search_kwargs={
-                "k": 20, 
-                "fetch_k": 50,
-                "filter": {"title": {"$in": active_sources}}
-            }
-        )
 
     # 2. BM25 Retriever (Sparse / Keyword)
     # Note: BM25 needs access to chunks. 
@@ -134,21 +124,15 @@ def get_hybrid_retriever(vectorstore, active_sources=None):
     # If we just loaded docs, we have them. If restarting, we might lack BM25 unless we fetch all from Chroma.
     # Let's fetch all docs from Chroma to build BM25. It's fast for <10k docs.
     
-    docs = vectorstore.get()['documents']
-    metadatas = vectorstore.get()['metadatas']
+    data = vectorstore.get(sources=active_sources)
+    docs = data['documents']
+    metadatas = data['metadatas']
     
     if not docs:
         return base_retriever # Fallback to just vector if empty
         
     # Reconstruct Documents for BM25
     bm25_docs = [Document(page_content=t, metadata=m) for t, m in zip(docs, metadatas)]
-    
-    # Filter BM25 docs if needed
-    if active_sources:
-        bm25_docs = [d for d in bm25_docs if d.metadata.get("title") in active_sources]
-        
-    if not bm25_docs:
-         return base_retriever
 
     bm25_retriever = BM25Retriever.from_documents(bm25_docs)
     bm25_retriever.k = 10
@@ -225,10 +209,7 @@ def query(question: str, history: str = "", filter_list: list[str] | None = None
         docs = retriever.invoke(question) # Gets top K from ensemble (typically 10-20)
     else:
         # Standard Vector Search
-        search_kwargs = {"k": 20}
-        if filter_list:
-             search_kwargs["filter"] = {"title": {"$in": filter_list}}
-        docs = vs.similarity_search(question, **search_kwargs)
+        docs = vs.similarity_search(question, k=20, sources=filter_list)
 
     # 2. Re-ranking (FlashRank)
     # Rerank the top 20 results to find the best 5
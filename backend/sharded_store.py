@@ -0,0 +1,222 @@
+"""Sharded Chroma store: chunks are partitioned across collections and searches fan out in parallel."""
+import os
+import json
+import heapq
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import chromadb
+from langchain_chroma import Chroma
+from langchain_chroma.vectorstores import maximal_marginal_relevance
+from langchain_core.documents import Document
+import config as cfg
+
+BASE_COLLECTION = "rag_documents"
+MANIFEST_FILE = "shards.json"
+
+# Shared by all stores; shard queries are I/O + numpy heavy, so threads parallelise well
+_pool = ThreadPoolExecutor(max_workers=cfg.SHARD_SEARCH_WORKERS)
+
+
+def _where(sources):
+    return {"title": {"$in": list(sources)}} if sources else None
+
+
+class ShardedStore:
+    """Routes writes to shards by source or size and merges per-shard results with a bounded heap.
+
+    The manifest (shards.json) records which sources and how many chunks each shard holds,
+    so filtered queries only touch the shards that contain the requested sources.
+    """
+
+    def __init__(self, persist_directory: str, embedding_function, strategy: str = cfg.SHARD_STRATEGY,
+                 max_chunks: int = cfg.SHARD_MAX_CHUNKS):
+        self.embeddings = embedding_function
+        self.strategy = strategy
+        self.max_chunks = max_chunks
+        self._client = chromadb.PersistentClient(path=persist_directory)
+        self._manifest_path = os.path.join(persist_directory, MANIFEST_FILE)
+        self._manifest = self._load_manifest()
+        self._shards = {}
+
+    # --- Manifest ---
+    def _load_manifest(self) -> dict:
+        if os.path.exists(self._manifest_path):
+            with open(self._manifest_path, encoding="utf-8") as f:
+                return json.load(f)
+        # No manifest yet: adopt a pre-sharding single collection as the first shard
+        manifest = {}
+        names = [c if isinstance(c, str) else c.name for c in self._client.list_collections()]
+        if BASE_COLLECTION in names:
+            metadatas = self._client.get_collection(BASE_COLLECTION).get(include=["metadatas"])["metadatas"]
+            manifest[BASE_COLLECTION] = {
+                "sources": sorted({(m or {}).get("title", "Unknown") for m in metadatas}),
+                "count": len(metadatas),
+            }
+        return manifest
+
+    def _save_manifest(self):
+        with open(self._manifest_path, "w", encoding="utf-8") as f:
+            json.dump(self._manifest, f)
+
+    def _shard(self, name: str) -> Chroma:
+        if name not in self._shards:
+            self._shards[name] = Chroma(client=self._client, collection_name=name, embedding_function=self.embeddings)
+        return self._shards[name]
+
+    def _register(self, name: str, title: str, n: int):
+        entry = self._manifest[name]
+        entry["count"] += n
+        if title not in entry["sources"]:
+            entry["sources"].append(title)
+
+    def _route(self, sources=None) -> list[str]:
+        if not sources:
+            return list(self._manifest)
+        wanted = set(sources)
+        return [name for name, entry in self._manifest.items() if wanted.intersection(entry["sources"])]
+
+    # --- Writes ---
+    def _plan(self, documents: list[Document]) -> dict:
+        """Map shard name -> documents. "source" keeps each source in one shard; "size" fills shards to max_chunks.
+
+        Works on a copy of the shard counts; the manifest is only updated once a shard write succeeds.
+        """
+        planned = {name: entry["count"] for name, entry in self._manifest.items()}
+        owners = {}
+        for name, entry in self._manifest.items():
+            for title in entry["sources"]:
+                owners.setdefault(title, name)
+
+        def writable():
+            if planned:
+                name = next(reversed(planned))
+                if planned[name] < self.max_chunks:
+                    return name
+            name = BASE_COLLECTION if not planned else f"{BASE_COLLECTION}_{len(planned)}"
+            planned[name] = 0
+            return name
+
+        groups = {}
+        if self.strategy == "size":
+            for doc in documents:
+                name = writable()
+                groups.setdefault(name, []).append(doc)
+                planned[name] += 1
+        else:
+            by_source = {}
+            for doc in documents:
+                by_source.setdefault(doc.metadata.get("title", "Unknown"), []).append(doc)
+            for title, docs in by_source.items():
+                name = owners.get(title) or writable()
+                owners[title] = name
+                groups.setdefault(name, []).extend(docs)
+                planned[name] += len(docs)
+        return groups
+
+    def add_documents(self, documents: list[Document]):
+        """Add documents, routing them to shards according to the sharding strategy."""
+        for name, docs in self._plan(documents).items():
+            self._shard(name).add_documents(docs)
+            self._manifest.setdefault(name, {"sources": [], "count": 0})
+            for doc in docs:
+                self._register(name, doc.metadata.get("title", "Unknown"), 1)
+            self._save_manifest()
+
+    def add_embedded(self, name: str, ids: list[str], documents: list[str], metadatas: list[dict], embeddings):
+        """Bulk-load chunks with precomputed embeddings into shard `name`, bypassing the embedding model."""
+        self._shard(name)._collection.add(ids=ids, documents=documents, metadatas=metadatas, embeddings=embeddings)
+        self._manifest.setdefault(name, {"sources": [], "count": 0})
+        for m in metadatas:
+            self._register(name, (m or {}).get("title", "Unknown"), 1)
+        self._save_manifest()
+
+    def clear(self):
+        """Delete every collection (shards and leftovers from failed writes) and reset the manifest."""
+        for c in self._client.list_collections():
+            self._client.delete_collection(c if isinstance(c, str) else c.name)
+        self._manifest = {}
+        self._shards = {}
+        self._save_manifest()
+
+    # --- Reads ---
+    def count(self) -> int:
+        return sum(entry["count"] for entry in self._manifest.values())
+
+    def iter_batches(self, batch_size: int = 1000):
+        """Yield (shard, page) for every shard, paging through at most `batch_size` chunks at a time."""
+        for name in self._route():
+            collection = self._shard(name)._collection
+            offset = 0
+            while True:
+                page = collection.get(limit=batch_size, offset=offset, include=["documents", "metadatas", "embeddings"])
+                if not len(page["ids"]):
+                    break
+                yield name, page
+                offset += len(page["ids"])
+
+    def get(self, sources=None) -> dict:
+        """Return ids/documents/metadatas from all shards, or only those holding `sources`."""
+        out = {"ids": [], "documents": [], "metadatas": []}
+        for name in self._route(sources):
+            data = self._shard(name).get(where=_where(sources))
+            for key in out:
+                out[key].extend(data[key])
+        return out
+
+    def _query_shard(self, name: str, embedding, n: int, where):
+        n = min(n, self._manifest[name]["count"])
+        if n <= 0:
+            return []
+        res = self._shard(name)._collection.query(
+            query_embeddings=[embedding],
+            n_results=n,
+            where=where,
+            include=["documents", "metadatas", "distances", "embeddings"],
+        )
+        return [
+            (dist, Document(page_content=text, metadata=meta or {}), emb)
+            for text, meta, dist, emb in zip(
+                res["documents"][0], res["metadatas"][0], res["distances"][0], res["embeddings"][0]
+            )
+        ]
+
+    def _fan_out(self, query: str, n: int, sources=None):
+        embedding = self.embeddings.embed_query(query)
+        where = _where(sources)
+        results = _pool.map(lambda name: self._query_shard(name, embedding, n, where), self._route(sources))
+        # Every shard returns its own top-n; a bounded heap keeps the global top-n (smallest distance)
+        hits = heapq.nsmallest(n, itertools.chain.from_iterable(results), key=lambda h: h[0])
+        return embedding, hits
+
+    def similarity_search(self, query: str, k: int = 4, sources=None) -> list[Document]:
+        _, hits = self._fan_out(query, k, sources)
+        return [doc for _, doc, _ in hits]
+
+    def max_marginal_relevance_search(self, query: str, k: int = 4, fetch_k: int = 20,
+                                      lambda_mult: float = 0.5, sources=None) -> list[Document]:
+        embedding, hits = self._fan_out(query, fetch_k, sources)
+        if not hits:
+            return []
+        selected = maximal_marginal_relevance(
+            np.array(embedding, dtype=np.float32), [emb for _, _, emb in hits], k=k, lambda_mult=lambda_mult
+        )
+        return [hits[i][1] for i in selected]
+
+    def as_retriever(self, search_type: str = "similarity", search_kwargs: dict | None = None, sources=None):
+        return ShardedRetriever(self, search_type, search_kwargs or {}, sources)
+
+
+class ShardedRetriever:
+    """Minimal retriever with the `invoke` interface used by the hybrid ensemble."""
+
+    def __init__(self, store: ShardedStore, search_type: str, search_kwargs: dict, sources=None):
+        self.store = store
+        self.search_type = search_type
+        self.search_kwargs = search_kwargs
+        self.sources = sources
+
+    def invoke(self, query: str) -> list[Document]:
+        if self.search_type == "mmr":
+            return self.store.max_marginal_relevance_search(query, sources=self.sources, **self.search_kwargs)
+        return self.store.similarity_search(query, sources=self.sources, **self.search_kwargs)
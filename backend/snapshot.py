@@ -0,0 +1,142 @@
+"""Knowledge-base snapshots: export/import chunks with their embeddings, no re-embedding needed.
+
+Format: gzip-compressed JSON lines. The first line is a header, each following line holds one
+batch of chunks from one shard with embeddings packed as base64 float16, or int8 plus a
+per-vector scale. Both directions stream batch by batch, so memory stays flat.
+
+The BM25 (sparse) index is rebuilt from chunk text at query time, so the chunk text in the
+snapshot is all it needs.
+
+    python snapshot.py export kb.snap.gz [--dtype float16|int8]
+    python snapshot.py import kb.snap.gz
+"""
+import argparse
+import base64
+import gzip
+import json
+import numpy as np
+import config as cfg
+
+FORMAT = "citeflow-snapshot"
+VERSION = 1
+BATCH_SIZE = 1000
+
+
+def _pack(embeddings: np.ndarray, dtype: str) -> dict:
+    if dtype == "float16":
+        return {"embeddings": base64.b64encode(embeddings.astype(np.float16).tobytes()).decode("ascii")}
+    # Symmetric per-vector int8 quantisation
+    scales = np.abs(embeddings).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    q = np.round(embeddings / scales[:, None]).astype(np.int8)
+    return {
+        "embeddings": base64.b64encode(q.tobytes()).decode("ascii"),
+        "scales": base64.b64encode(scales.astype(np.float32).tobytes()).decode("ascii"),
+    }
+
+
+DTYPES = ("float16", "int8")
+
+
+def _unpack(record: dict, dtype: str) -> np.ndarray:
+    raw = base64.b64decode(record["embeddings"])
+    n = len(record["ids"])
+    if dtype == "float16":
+        return np.frombuffer(raw, dtype=np.float16).reshape(n, -1).astype(np.float32)
+    scales = np.frombuffer(base64.b64decode(record["scales"]), dtype=np.float32)
+    return np.frombuffer(raw, dtype=np.int8).reshape(n, -1).astype(np.float32) * scales[:, None]
+
+
+def export_snapshot(store, path: str, dtype: str = "float16") -> int:
+    """Write every chunk in `store` to `path`. Returns the number of chunks exported."""
+    if dtype not in DTYPES:
+        raise ValueError(f"Unsupported dtype: {dtype}")
+    total = 0
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(json.dumps({
+            "format": FORMAT, "version": VERSION, "dtype": dtype, "embedding_model": cfg.EMBEDDING_MODEL,
+        }) + "\n")
+        for shard, page in store.iter_batches(BATCH_SIZE):
+            f.write(json.dumps({
+                "shard": shard,
+                "ids": list(page["ids"]),
+                "documents": list(page["documents"]),
+                "metadatas": list(page["metadatas"]),
+                **_pack(np.asarray(page["embeddings"], dtype=np.float32), dtype),
+            }) + "\n")
+            total += len(page["ids"])
+    return total
+
+
+def _read_header(f) -> dict:
+    header = json.loads(f.readline() or "{}")
+    if header.get("format") != FORMAT or header.get("version") != VERSION:
+        raise ValueError("Not a CiteFlow snapshot (or unsupported version).")
+    if header.get("dtype") not in DTYPES:
+        raise ValueError(f"Unsupported dtype: {header.get('dtype')}")
+    if header.get("embedding_model") != cfg.EMBEDDING_MODEL:
+        raise ValueError(f"Snapshot was embedded with {header.get('embedding_model')}, expected {cfg.EMBEDDING_MODEL}.")
+    return header
+
+
+def validate_snapshot(path: str) -> int:
+    """Check the header and every record without loading anything. Returns the number of chunks."""
+    total, dim = 0, None
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = _read_header(f)
+        for i, line in enumerate(f, start=2):
+            try:
+                record = json.loads(line)
+                n = len(record["ids"])
+                if not (n == len(record["documents"]) == len(record["metadatas"])) or not record["shard"]:
+                    raise ValueError("ids/documents/metadatas lengths differ")
+                embeddings = _unpack(record, header["dtype"])
+                if len(embeddings) != n or (dim is not None and embeddings.shape[1] != dim):
+                    raise ValueError("embedding shape mismatch")
+                dim = embeddings.shape[1]
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"Corrupt snapshot record on line {i}: {e}")
+            total += n
+    return total
+
+
+def import_snapshot(store, path: str) -> int:
+    """Bulk-load a snapshot into an empty `store`. Returns the number of chunks imported.
+
+    The whole file is validated first; if loading still fails, the store is cleared again
+    so the import can simply be retried.
+    """
+    if store.count():
+        raise ValueError("Knowledge base is not empty. Clear it before importing a snapshot.")
+    validate_snapshot(path)
+    total = 0
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            header = _read_header(f)
+            for line in f:
+                record = json.loads(line)
+                embeddings = _unpack(record, header["dtype"])
+                store.add_embedded(record["shard"], record["ids"], record["documents"], record["metadatas"],
+                                   embeddings.tolist())
+                total += len(record["ids"])
+    except Exception:
+        store.clear()
+        raise
+    return total
+
+
+if __name__ == "__main__":
+    from sharded_store import ShardedStore
+
+    parser = argparse.ArgumentParser(description="Export or import a knowledge-base snapshot.")
+    parser.add_argument("action", choices=["export", "import"])
+    parser.add_argument("path")
+    parser.add_argument("--dtype", choices=DTYPES, default="float16")
+    args = parser.parse_args()
+
+    # No embedding function: snapshots carry their vectors, so the model is never loaded
+    store = ShardedStore(cfg.CHROMA_PATH, None)
+    if args.action == "export":
+        print(f"Exported {export_snapshot(store, args.path, args.dtype)} chunks to {args.path}")
+    else:
+        print(f"Imported {import_snapshot(store, args.path)} chunks from {args.path}")
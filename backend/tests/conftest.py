@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Backend modules are imported top-level (`import config`), as uvicorn does from backend/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
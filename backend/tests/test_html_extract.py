@@ -0,0 +1,76 @@
+from html_extract import extract_main_content, remove_repeated_blocks
+
+
+def _blocks(sections):
+    return [b for s in sections for b in s["blocks"]]
+
+
+def test_wrapper_with_boilerplate_class_keeps_content():
+    html = ('<html><head><title>T</title></head><body><div id="page" class="layout has-sidebar">'
+            '<div class="content"><h1>Guide</h1><p>Important content about quotas.</p></div>'
+            '<div class="sidebar"><a href="/a">Quickstart</a> <a href="/b">Limits</a></div></div></body></html>')
+    title, sections = extract_main_content(html)
+    assert title == "T"
+    assert sections == [{"headings": ["Guide"], "blocks": ["Important content about quotas."]}]
+
+
+def test_dialog_role_on_content_wrapper_is_kept():
+    html = ('<body><div role="dialog" class="page-with-toc related-area"><h1>X</h1>'
+            '<p>Body text that matters.</p></div></body>')
+    assert _blocks(extract_main_content(html)[1]) == ["Body text that matters."]
+
+
+def test_direct_text_of_containers_is_kept():
+    html = "<main>Intro.<div class='note'>Quotas reset daily at <b>midnight</b> UTC.<p>See limits.</p></div></main>"
+    assert _blocks(extract_main_content(html)[1]) == ["Intro.", "Quotas reset daily at midnight UTC.", "See limits."]
+
+
+def test_small_link_dense_chrome_is_removed():
+    html = ('<body><div class="breadcrumbs"><a href="/">Home</a> / <a href="/docs">Docs</a></div>'
+            '<div><h1>Errors</h1><p>Error 503 means the service is overloaded; retry with backoff.</p></div></body>')
+    assert _blocks(extract_main_content(html)[1]) == ["Error 503 means the service is overloaded; retry with backoff."]
+
+
+def test_bytes_use_meta_charset():
+    html = '<html><head><meta charset="utf-8"></head><body><p>Café – naïve</p></body></html>'.encode("utf-8")
+    assert _blocks(extract_main_content(html)[1]) == ["Café – naïve"]
+
+
+def _page(*blocks):
+    return [{"headings": ["H"], "blocks": list(blocks)}]
+
+
+def test_repeated_blocks_need_a_majority_of_pages():
+    footer = "© 2024 Acme Cloud. All rights reserved."
+    pages = [_page("a", footer), _page("b", footer.replace("2024", "2025")), _page("c"), _page("d", footer)]
+    # Near-duplicate footer on 3 of 4 pages (threshold 3) goes; unique blocks stay
+    assert [_blocks(p) for p in remove_repeated_blocks(pages)] == [["a"], ["b"], ["c"], ["d"]]
+
+    # On 2 of 4 pages it stays
+    pages = [_page("a", footer), _page("b", footer), _page("c"), _page("d")]
+    assert [_blocks(p) for p in remove_repeated_blocks(pages)] == [["a", footer], ["b", footer], ["c"], ["d"]]
+
+
+def test_single_page_is_untouched():
+    pages = [_page("a", "a")]
+    assert remove_repeated_blocks(pages) == pages
+
+
+def test_blocks_nested_in_blocks_are_emitted_once():
+    html = ("<main><ul><li><div>Alpha item</div></li><li>Step one<div>detail</div></li></ul>"
+            "<table><tr><td><div>Cell one</div></td><td>2</td></tr></table></main>")
+    assert _blocks(extract_main_content(html)[1]) == ["Alpha item", "Step one detail", "Cell one | 2"]
+
+
+def test_non_latin_pages_keep_their_content():
+    footer = "© 2024 Пример. Все права защищены. Политика конфиденциальности."
+    pages = [_page("Квоты сбрасываются ежедневно в полночь.", footer),
+             _page("Ошибка 503 означает, что сервис перегружен.", footer)]
+    assert [_blocks(p) for p in remove_repeated_blocks(pages)] == [
+        ["Квоты сбрасываются ежедневно в полночь."], ["Ошибка 503 означает, что сервис перегружен."]
+    ]
+
+
+def test_numeric_rows_are_not_template_text():
+    pages = [_page("2019 | 15", "Yes"), _page("2023 | 99", "Yes")]
+    assert [_blocks(p) for p in remove_repeated_blocks(pages)] == [["2019 | 15", "Yes"], ["2023 | 99", "Yes"]]
@@ -0,0 +1,18 @@
+import config as cfg
+from loaders import section_documents
+
+
+def test_small_sections_are_packed_and_long_ones_split():
+    sentence = "Lifecycle rules move objects between storage classes after a number of days. "
+    sections = [
+        {"headings": ["Storage"], "blocks": ["Buckets are regional."]},
+        {"headings": ["Storage", "Classes"], "blocks": ["Standard, infrequent and archive."]},
+        {"headings": ["Storage", "Lifecycle"], "blocks": [sentence * 40]},
+    ]
+    docs = section_documents("https://example.com/storage", "Storage", sections)
+
+    assert docs[0].metadata["section"] == "Storage"
+    assert "Standard, infrequent and archive." in docs[0].page_content
+    lifecycle = [d for d in docs if d.metadata["section"] == "Storage > Lifecycle"]
+    assert len(lifecycle) > 1
+    assert all(len(d.page_content) <= cfg.CHUNK_SIZE for d in docs)
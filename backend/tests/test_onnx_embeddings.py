@@ -0,0 +1,53 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+from onnx_embeddings import OnnxEmbeddings
+
+
+def _batcher(encode, max_batch_size=4):
+    # Skip model loading; only the batching machinery is under test
+    emb = OnnxEmbeddings.__new__(OnnxEmbeddings)
+    emb._encode = encode
+    emb._start_batcher(max_batch_size)
+    return emb
+
+
+def test_lone_query_returns_immediately():
+    emb = _batcher(lambda texts: np.array([[float(len(t))] for t in texts]))
+    start = time.perf_counter()
+    assert emb.embed_query("abc") == [3.0]
+    assert time.perf_counter() - start < 0.5
+
+
+def test_concurrent_queries_share_bounded_batches():
+    sizes, lock = [], threading.Lock()
+
+    def encode(texts):
+        with lock:
+            sizes.append(len(texts))
+        time.sleep(0.05)  # Let other callers queue up behind this batch
+        return np.array([[float(t)] for t in texts])
+
+    emb = _batcher(encode, max_batch_size=4)
+    with ThreadPoolExecutor(max_workers=12) as pool:
+        results = list(pool.map(emb.embed_query, [str(i) for i in range(12)]))
+
+    assert results == [[float(i)] for i in range(12)]
+    assert sum(sizes) == 12
+    assert max(sizes) <= 4
+    assert max(sizes) > 1
+
+
+def test_encode_error_reaches_every_caller():
+    def encode(texts):
+        time.sleep(0.05)
+        raise RuntimeError("onnx failed")
+
+    emb = _batcher(encode)
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        futures = [pool.submit(emb.embed_query, f"q{i}") for i in range(6)]
+        for f in futures:
+            with pytest.raises(RuntimeError, match="onnx failed"):
+                f.result(timeout=5)
@@ -0,0 +1,52 @@
+import math
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from sharded_store import ShardedStore
+
+
+class AngleEmbeddings(Embeddings):
+    """Text "0.3" embeds to the unit vector at angle 0.3 rad, so distances to "0" grow with the number."""
+
+    def embed_documents(self, texts):
+        return [self.embed_query(t) for t in texts]
+
+    def embed_query(self, text):
+        angle = float(text)
+        return [math.cos(angle), math.sin(angle)]
+
+
+class FailingEmbeddings(AngleEmbeddings):
+    def embed_documents(self, texts):
+        raise RuntimeError("embedding failed")
+
+
+def _docs(values, title="src"):
+    return [Document(page_content=str(v), metadata={"title": title}) for v in values]
+
+
+def test_top_k_is_merged_across_shards(tmp_path):
+    store = ShardedStore(str(tmp_path), AngleEmbeddings(), strategy="size", max_chunks=3)
+    # Interleave so the best hits are spread over all three shards
+    store.add_documents(_docs([0.1, 0.5, 0.9, 0.2, 0.6, 1.0, 0.3, 0.7, 1.1]))
+    assert len(store._route()) == 3
+
+    hits = store.similarity_search("0", k=4)
+    assert [d.page_content for d in hits] == ["0.1", "0.2", "0.3", "0.5"]
+
+
+def test_sources_route_to_owning_shards_only(tmp_path):
+    store = ShardedStore(str(tmp_path), AngleEmbeddings(), strategy="source", max_chunks=2)
+    store.add_documents(_docs([0.1, 0.2], "a") + _docs([0.3, 0.4], "b") + _docs([0.5], "c"))
+
+    assert len(store._route(["b"])) == 1
+    hits = store.max_marginal_relevance_search("0", k=3, fetch_k=5, sources=["b", "c"])
+    assert {d.metadata["title"] for d in hits} == {"b", "c"}
+
+
+def test_failed_write_leaves_manifest_untouched(tmp_path):
+    store = ShardedStore(str(tmp_path), FailingEmbeddings())
+    with pytest.raises(RuntimeError):
+        store.add_documents(_docs([0.1, 0.2]))
+    assert store.count() == 0
+    assert store._route() == []
@@ -0,0 +1,95 @@
+import gzip
+import json
+import numpy as np
+import pytest
+from sharded_store import ShardedStore
+from snapshot import _pack, _unpack, export_snapshot, import_snapshot
+
+
+def _unit_vectors(n, dim=384, seed=0):
+    v = np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize("dtype,tol", [("float16", 1e-3), ("int8", 1e-2)])
+def test_quantisation_round_trip(dtype, tol):
+    vectors = _unit_vectors(50)
+    record = {"ids": [str(i) for i in range(50)], **_pack(vectors, dtype)}
+    restored = _unpack(json.loads(json.dumps(record)), dtype)
+    assert restored.shape == vectors.shape
+    assert np.abs(restored - vectors).max() < tol
+    # Retrieval only cares about direction
+    assert (restored * vectors).sum(axis=1).min() > 0.999
+
+
+def _filled_store(path, n=30):
+    # No embedding function: vectors are loaded as-is
+    store = ShardedStore(str(path), None, strategy="size", max_chunks=10)
+    for start in range(0, n, 10):
+        ids = [str(i) for i in range(start, start + 10)]
+        store.add_embedded(f"rag_documents_{start // 10}" if start else "rag_documents", ids,
+                           [f"chunk {i}" for i in ids], [{"title": f"src{start // 10}"} for _ in ids],
+                           _unit_vectors(10, seed=start).tolist())
+    return store
+
+
+def test_export_import_round_trip(tmp_path):
+    source = _filled_store(tmp_path / "a")
+    snap = str(tmp_path / "kb.snap.gz")
+    assert export_snapshot(source, snap, "int8") == 30
+
+    target = ShardedStore(str(tmp_path / "b"), None)
+    assert import_snapshot(target, snap) == 30
+    assert target._manifest == source._manifest
+    assert sorted(target.get()["documents"]) == sorted(source.get()["documents"])
+
+
+def test_corrupt_snapshot_is_rejected_before_writing(tmp_path):
+    snap = str(tmp_path / "kb.snap.gz")
+    export_snapshot(_filled_store(tmp_path / "a"), snap)
+    with gzip.open(snap, "rt", encoding="utf-8") as f:
+        lines = f.readlines()
+    broken = json.loads(lines[-1])
+    broken["ids"] = broken["ids"][:-1]
+    with gzip.open(snap, "wt", encoding="utf-8") as f:
+        f.writelines(lines[:-1] + [json.dumps(broken) + "\n"])
+
+    target = ShardedStore(str(tmp_path / "b"), None)
+    with pytest.raises(ValueError, match="line 4"):
+        import_snapshot(target, snap)
+    assert target.count() == 0
+
+
+def test_failed_load_is_rolled_back(tmp_path, monkeypatch):
+    snap = str(tmp_path / "kb.snap.gz")
+    export_snapshot(_filled_store(tmp_path / "a"), snap)
+    target = ShardedStore(str(tmp_path / "b"), None)
+
+    original, calls = target.add_embedded, []
+    def flaky(*args):
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError("disk full")
+        original(*args)
+    monkeypatch.setattr(target, "add_embedded", flaky)
+    with pytest.raises(RuntimeError):
+        import_snapshot(target, snap)
+    assert target.count() == 0 and target.get()["ids"] == []
+
+    monkeypatch.undo()
+    assert import_snapshot(target, snap) == 30
+
+
+def test_clear_then_import_in_one_process(tmp_path):
+    # Mirrors clear_vectorstore() followed by POST /api/snapshot in a running server
+    path = tmp_path / "kb"
+    store = _filled_store(path)
+    snap = str(tmp_path / "kb.snap.gz")
+    export_snapshot(store, snap)
+    store.clear()
+
+    fresh = ShardedStore(str(path), None)
+    assert fresh.count() == 0
+    assert import_snapshot(fresh, snap) == 30
+    fresh.add_embedded("rag_documents", ["extra"], ["extra chunk"], [{"title": "src0"}], _unit_vectors(1).tolist())
+    assert fresh.count() == 31